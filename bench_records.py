@@ -0,0 +1,122 @@
+"""정렬 결과 보관 방식 비교 벤치마크
+
+기존 방식 (행 dict 리스트 → DataFrame → iterrows) 과
+EnvelopeRecords (컬럼 배열) 의 메모리 사용량과 반복 비용을 측정합니다.
+
+    python bench_records.py            # 10,000건
+    python bench_records.py 50000      # 건수 지정
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from envelope_records import EnvelopeRecords
+
+
+def make_rows(count, seed=0):
+    """테스트용 (상가명, 상호, 금액) 행 생성
+
+    sort_data_by_number_file 처럼 상가명 문자열은 행마다 새로 만듭니다.
+    """
+    rng = random.Random(seed)
+    return [
+        (f"{rng.randrange(1, 60)}상가", f"상호{i:05d}", rng.randrange(1, 200) * 1000)
+        for i in range(count)
+    ]
+
+
+def build_dataframe(rows):
+    """기존 sort_data_by_number_file 결과 구성 방식"""
+    result_rows = []
+    for store_name, business_name, amount in rows:
+        result_rows.append({
+            '상가명': store_name,
+            '상호': business_name,
+            '금액': amount
+        })
+    return pd.DataFrame(result_rows)
+
+
+def build_records(rows):
+    records = EnvelopeRecords()
+    for store_name, business_name, amount in rows:
+        records.append(store_name, business_name, amount)
+    return records
+
+
+def iterate_dataframe(df):
+    """기존 create_envelopes_pdf 의 행 처리"""
+    total = 0
+    for idx, row in df.iterrows():
+        store_name = str(row["상가명"]) if pd.notna(row["상가명"]) else ""
+        business_name = str(row["상호"]) if pd.notna(row["상호"]) else ""
+        amount = row["금액"]
+        if isinstance(amount, (int, float)):
+            amount_str = f"{amount:,.0f}원"
+        else:
+            amount_str = str(amount)
+        total += len(store_name) + len(business_name) + len(amount_str)
+    return total
+
+
+def iterate_records(records):
+    total = 0
+    for store_name, business_name, amount_str in records:
+        total += len(store_name) + len(business_name) + len(amount_str)
+    return total
+
+
+def measure_memory(build, count):
+    """행 생성부터 결과 객체까지, 결과가 유지하는 메모리 (bytes)
+
+    입력 행은 결과를 만든 뒤 버리므로 결과가 붙잡고 있는 문자열만 남습니다.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build(make_rows(count))
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del result
+    return size
+
+
+def measure_time(func, arg, repeat=5):
+    """최소 실행 시간 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count):
+    df_mem = measure_memory(build_dataframe, count)
+    rec_mem = measure_memory(build_records, count)
+
+    rows = make_rows(count)
+    df = build_dataframe(rows)
+    records = build_records(rows)
+    assert iterate_dataframe(df) == iterate_records(records)
+
+    df_build = measure_time(build_dataframe, rows)
+    rec_build = measure_time(build_records, rows)
+    df_iter = measure_time(iterate_dataframe, df)
+    rec_iter = measure_time(iterate_records, records)
+
+    print(f"레코드 {count:,}건")
+    print(f"{'':12}{'DataFrame':>14}{'Records':>14}{'비율':>8}")
+    print(f"{'메모리(KiB)':12}{df_mem / 1024:>14,.1f}{rec_mem / 1024:>14,.1f}{df_mem / rec_mem:>8.1f}x")
+    print(f"{'생성(ms)':12}{df_build * 1000:>14,.2f}{rec_build * 1000:>14,.2f}{df_build / rec_build:>8.1f}x")
+    print(f"{'반복(ms)':12}{df_iter * 1000:>14,.2f}{rec_iter * 1000:>14,.2f}{df_iter / rec_iter:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
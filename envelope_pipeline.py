@@ -0,0 +1,345 @@
+import datetime
+import io
+import os
+import zipfile
+
+import pandas as pd
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase import pdfmetrics
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font as XLFont, Side
+from openpyxl.xml.constants import ARC_CORE
+from openpyxl.xml.functions import tostring
+
+from envelope_records import EnvelopeRecords, RECORD_COLUMNS
+
+# 현재 실행 경로
+base_dir = os.path.dirname(os.path.abspath(__file__))
+number_file_path = os.path.join(base_dir, "number.xlsm")
+image_path = os.path.join(base_dir, "g.jpg")
+
+# 한글 폰트 후보 경로
+FONT_PATHS = [
+    # Linux (Streamlit Cloud)
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumBarunGothic.ttf",
+    "/usr/share/fonts/truetype/nanum-coding/NanumGothicCoding.ttf",
+    # Windows
+    "C:/Windows/Fonts/H2GTRE.TTF",
+    "C:/Windows/Fonts/malgun.ttf",
+    "C:/Windows/Fonts/gulim.ttc",
+    "C:/Windows/Fonts/batang.ttc",
+    # macOS
+    "/System/Library/Fonts/AppleGothic.ttf",
+    "/Library/Fonts/AppleGothic.ttf",
+]
+
+KOREAN_FONT_NAME = "KoreanFont"
+FALLBACK_FONT_NAME = "Helvetica"
+
+# reproducible 모드의 기본 생성 일시 (reportlab invariant 와 같은 2000-01-01 UTC)
+DEFAULT_SOURCE_DATE_EPOCH = 946684800
+
+
+class EnvelopeDataError(ValueError):
+    """업로드 데이터로 봉투를 만들 수 없을 때 발생"""
+
+
+# 한글 폰트 등록
+def register_font():
+    """한글 폰트 등록 → (성공 여부, 폰트 파일명)"""
+    for font_path in FONT_PATHS:
+        if os.path.exists(font_path):
+            try:
+                pdfmetrics.registerFont(TTFont(KOREAN_FONT_NAME, font_path))
+                return True, os.path.basename(font_path)
+            except Exception:
+                continue
+
+    # 기본 폰트 사용
+    return False, None
+
+
+def load_logo():
+    """로고 이미지 (없으면 None)"""
+    return ImageReader(image_path) if os.path.exists(image_path) else None
+
+
+def load_number_table():
+    """number.xlsm 불러오기"""
+    if not os.path.exists(number_file_path):
+        raise EnvelopeDataError(f"❌ {number_file_path} 파일을 찾을 수 없습니다.")
+
+    df_number = pd.read_excel(number_file_path)
+    df_number.columns = df_number.columns.str.strip()
+    return df_number
+
+
+def reproducible_datetime():
+    """reproducible 모드의 고정 생성 일시 (SOURCE_DATE_EPOCH, 없으면 2000-01-01 UTC)"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    epoch = int(epoch) if epoch else DEFAULT_SOURCE_DATE_EPOCH
+    return datetime.datetime.fromtimestamp(epoch, tz=datetime.timezone.utc).replace(tzinfo=None)
+
+
+def find_column(df, *keywords):
+    """키워드가 포함된 첫 번째 컬럼 (없으면 None)"""
+    for col in df.columns:
+        if any(keyword in str(col) for keyword in keywords):
+            return col
+    return None
+
+
+# 데이터 정렬 함수
+def sort_records(uploaded_df, df_number):
+    """업로드된 데이터를 number.xlsm 기준으로 정렬 → (레코드, 무결성 불일치 목록)"""
+    # 컬럼명 확인 및 정리
+    if uploaded_df.columns[0].startswith('Unnamed'):
+        # 첫 행이 실제 헤더인 경우
+        uploaded_df.columns = uploaded_df.iloc[0]
+        uploaded_df = uploaded_df[1:].reset_index(drop=True)
+
+    uploaded_df.columns = uploaded_df.columns.str.strip()
+
+    # 상호 컬럼 찾기
+    business_col = find_column(uploaded_df, '상호')
+    if business_col is None:
+        raise EnvelopeDataError("❌ 업로드된 파일에서 '상호' 컬럼을 찾을 수 없습니다.")
+
+    # 금액 컬럼 찾기
+    amount_col = find_column(uploaded_df, '금액', '입금')
+    if amount_col is None:
+        raise EnvelopeDataError("❌ 업로드된 파일에서 '금액' 컬럼을 찾을 수 없습니다.")
+
+    # 원본 파일에 상가명 컬럼이 있는지 확인
+    original_brand_col = find_column(uploaded_df, '상가')
+
+    # number.xlsm의 컬럼 확인
+    brand_col = df_number.columns[0]  # 브랜드/상가명
+    number_business_col = df_number.columns[1]  # 상호
+    order_col = df_number.columns[2]  # 순서
+
+    # 데이터 병합
+    merged_df = uploaded_df.merge(
+        df_number[[brand_col, number_business_col, order_col]],
+        left_on=business_col,
+        right_on=number_business_col,
+        how='left'
+    )
+
+    # ✅ 수정: 원본 파일에 상가명이 있으면 원본 상가명을 우선 사용
+    # 이렇게 해야 원본 데이터의 의도를 존중하고 중복 문제를 방지함
+    if original_brand_col:
+        # 원본에 상가명이 있는 경우 원본 상가명 사용, 없으면 number.xlsm 상가명 사용
+        merged_df[brand_col] = merged_df[original_brand_col].fillna(merged_df[brand_col])
+
+    # 매칭 여부 확인 (순서번호가 있으면 매칭된 것)
+    merged_df['has_order'] = merged_df[order_col].notna()
+
+    # number.xlsm에 있는 모든 상가명 목록
+    all_brands_in_number = df_number[brand_col].unique()
+
+    # 정렬을 위한 키 생성
+    def get_sort_key(row):
+        brand = row[brand_col] if pd.notna(row[brand_col]) else ""
+        has_order = row['has_order']
+        order_num = row[order_col] if pd.notna(row[order_col]) else 999999
+
+        # 해당 상가가 number.xlsm에 존재하는지 확인
+        brand_exists_in_number = brand in all_brands_in_number
+
+        if not brand_exists_in_number:
+            # number.xlsm에 아예 없는 상가 → 맨 앞 (0)
+            return (0, brand, 0, 0)
+        elif has_order:
+            # number.xlsm에 있고 순서번호도 있음 → 중간 (1)
+            return (1, brand, 0, order_num)
+        else:
+            # number.xlsm에 상가는 있지만 이 상호는 없음 → 해당 상가의 뒤 (1, brand, 1)
+            return (1, brand, 1, 999999)
+
+    merged_df['sort_key'] = merged_df.apply(get_sort_key, axis=1)
+    merged_df = merged_df.sort_values('sort_key').reset_index(drop=True)
+
+    # 상가명 앞에 순서번호 추가
+    records = EnvelopeRecords()
+    current_brand = None
+    brand_counter = 0
+
+    for brand_value, business_value, amount, has_order in zip(
+        merged_df[brand_col], merged_df[business_col],
+        merged_df[amount_col], merged_df['has_order']
+    ):
+        brand_name = str(brand_value) if pd.notna(brand_value) else ""
+        business_name = str(business_value) if pd.notna(business_value) else ""
+
+        # 순서번호가 있는 경우에만 상가명 앞에 번호 추가
+        if has_order and brand_name:
+            # 새로운 상가가 시작되면 카운터 리셋
+            if brand_name != current_brand:
+                current_brand = brand_name
+                brand_counter = 1
+            else:
+                brand_counter += 1
+
+            # 이미 숫자로 시작하는 경우 그대로 사용
+            if brand_name and brand_name[0].isdigit():
+                formatted_brand = brand_name
+            else:
+                formatted_brand = f"{brand_counter}{brand_name}"
+        else:
+            # 순서번호가 없으면 상가명만 (번호 없이)
+            formatted_brand = brand_name
+
+        records.append(formatted_brand, business_name, amount)
+
+    # ✅ 최종 검증: 정렬 후 데이터 무결성 체크
+    # 원본 데이터와 결과 데이터의 상호-금액 매핑이 일치하는지 확인
+    mismatches = []
+
+    # 원본 데이터의 상호별 금액 목록
+    original_amounts_by_business = {}
+    for business, amount in zip(uploaded_df[business_col], uploaded_df[amount_col]):
+        original_amounts_by_business.setdefault(business, []).append(amount)
+
+    for business, amount in zip(records.business_names(), records.amounts()):
+        # 원본 데이터에서 같은 상호 찾기
+        original_amounts = original_amounts_by_business.get(business)
+
+        if original_amounts:
+            # 원본 금액과 비교
+            if amount not in original_amounts:
+                mismatches.append(f"상호 '{business}': 결과금액={amount}, 원본금액={original_amounts}")
+
+    return records, mismatches
+
+
+# PDF 생성 함수
+def render_envelopes_pdf(records, output, font_name=FALLBACK_FONT_NAME, extra_text="",
+                         text_size=12, text_color=(0, 0, 0), logo=None, reproducible=False):
+    """봉투 PDF 생성 (output: 파일 경로 또는 파일 객체)
+
+    logo 를 넘기면 이미 읽어 둔 로고를 사용하고, 없으면 g.jpg 를 읽습니다.
+    reproducible=True 이면 같은 입력에 대해 항상 같은 바이트를 만듭니다
+    (생성 일시 고정, 문서 ID 는 내용에서 계산). 생성 일시는 기본 2000-01-01 이며
+    SOURCE_DATE_EPOCH 환경 변수로 바꿀 수 있습니다.
+    """
+    # 봉투 크기 설정
+    mm_to_pt = 2.8346457
+    envelope_width = 220 * mm_to_pt
+    envelope_height = 110 * mm_to_pt
+
+    # PDF 생성
+    c = canvas.Canvas(output, pagesize=(envelope_width, envelope_height),
+                      invariant=1 if reproducible else None)
+
+    # 공통 설정
+    font_size = 18
+    start_x = 100
+    start_y = envelope_height - 230
+
+    # 로고 설정
+    logo_size = (100, 100)
+    logo_position = (envelope_width - 100, envelope_height - 100)
+    brand_position = (envelope_width - 90, envelope_height - 85)
+
+    # 추가 텍스트 위치
+    extra_text_y = start_y - 50
+
+    # 로고는 한 번만 읽어서 모든 페이지에 재사용
+    if logo is None:
+        logo = load_logo()
+
+    for store_name, business_name, amount_str in records:
+        c.setFont(font_name, font_size)
+
+        # 로고 삽입
+        if logo is not None:
+            c.drawImage(logo, logo_position[0], logo_position[1],
+                       width=logo_size[0], height=logo_size[1], mask='auto')
+
+        # 브랜드명
+        c.setFont(font_name, 18)
+        c.setFillColorRGB(0, 0, 0)
+        c.drawRightString(brand_position[0] - 20, brand_position[1] + 45, "기린")
+        c.drawRightString(brand_position[0], brand_position[1] + 10, "(길라인)")
+
+        # 한 줄에 상가명 → 상호 → 금액 순으로, 위치 자동 조절
+        x = start_x
+
+        # 상가명
+        c.setFillColorRGB(0, 0, 0)  # 기본 검정색
+        c.drawString(x, start_y, store_name)
+        store_width = stringWidth(store_name, font_name, font_size)
+        x += store_width + 30
+
+        # 상호
+        c.setFillColorRGB(0, 0, 0)
+        c.drawString(x, start_y, business_name)
+        biz_width = stringWidth(business_name, font_name, font_size)
+        x += biz_width + 30
+
+        # 금액
+        c.setFillColorRGB(0, 0, 0)
+        c.drawString(x, start_y, amount_str)
+
+        # 추가 텍스트
+        if extra_text:
+            c.setFont(font_name, text_size)
+            c.setFillColorRGB(text_color[0], text_color[1], text_color[2])
+            c.drawString(start_x, extra_text_y, extra_text)
+
+        c.showPage()
+
+    c.save()
+
+
+# Excel 생성 함수
+def write_sorted_excel(records, output, reproducible=False):
+    """정렬된 레코드를 엑셀로 저장 (output: 파일 경로 또는 파일 객체)
+
+    reproducible=True 이면 문서 속성(docProps/core.xml)의 생성/수정 일시와
+    zip 항목 일시를 reproducible_datetime() 으로 고정해 같은 입력에 대해
+    항상 같은 바이트를 만듭니다.
+    """
+    wb_new = Workbook()
+    ws_new = wb_new.active
+    ws_new.title = 'Sheet1'
+
+    # 레코드를 행 단위로 바로 기록 (DataFrame 변환 없음)
+    ws_new.append(RECORD_COLUMNS)
+    for row in records.iter_values():
+        ws_new.append(row)
+
+    # 헤더 스타일 적용 (pandas to_excel 헤더와 같은 굵게 + 얇은 테두리 + 가운데 정렬)
+    thin = Side(style='thin')
+    for col_idx in range(1, len(RECORD_COLUMNS) + 1):
+        cell = ws_new.cell(row=1, column=col_idx)
+        cell.font = XLFont(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+
+    if not reproducible:
+        wb_new.save(output)
+        return
+
+    # openpyxl 은 저장할 때 수정 일시를 현재 시각으로 덮어쓰므로,
+    # 일단 저장한 뒤 core.xml 을 다시 쓰고 zip 항목 일시를 고정해서 옮겨 담음
+    buffer = io.BytesIO()
+    wb_new.save(buffer)
+
+    fixed = reproducible_datetime()
+    wb_new.properties.created = fixed
+    wb_new.properties.modified = fixed
+    core_xml = tostring(wb_new.properties.to_tree())
+
+    with zipfile.ZipFile(buffer) as source, \
+            zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = core_xml if info.filename == ARC_CORE else source.read(info)
+            entry = zipfile.ZipInfo(info.filename, date_time=fixed.timetuple()[:6])
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            target.writestr(entry, data)
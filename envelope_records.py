@@ -0,0 +1,137 @@
+import math
+import numbers
+from array import array
+
+import pandas as pd
+
+# 정렬 결과 컬럼 (엑셀 출력 헤더 순서)
+RECORD_COLUMNS = ('상가명', '상호', '금액')
+
+# int64 범위 (array 'q')
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def format_amount(amount):
+    """금액 쉼표 포맷 적용 (숫자가 아니면 문자열 그대로)"""
+    if isinstance(amount, numbers.Real):
+        return f"{amount:,.0f}원"
+    return str(amount)
+
+
+def _as_int_amount(amount):
+    """정수로 보관할 수 있는 금액이면 int, 아니면 None"""
+    if isinstance(amount, bool) or not isinstance(amount, numbers.Real):
+        return None
+    if isinstance(amount, numbers.Integral):
+        value = int(amount)
+    elif math.isfinite(amount) and float(amount).is_integer():
+        value = int(amount)
+    else:
+        return None
+    if _INT64_MIN <= value <= _INT64_MAX:
+        return value
+    return None
+
+
+class EnvelopeRecords:
+    """정렬된 봉투 레코드를 컬럼 배열로 보관
+
+    상가명과 출력용 금액 문자열은 고유값 테이블 + 코드 배열로, 금액은
+    int64 배열로 저장합니다. 금액 문자열은 같은 금액마다 한 번만 만듭니다.
+    반복(iteration)은 (상가명, 상호, 금액문자열) 튜플을 바로 내주므로
+    렌더러/내보내기에서 행마다 Series 를 만들 필요가 없습니다.
+    """
+
+    __slots__ = (
+        '_store_table', '_store_index', '_store_codes',
+        '_businesses', '_amounts',
+        '_amount_str_table', '_amount_str_index', '_amount_str_codes',
+        '_amount_code_cache', '_raw_amounts',
+    )
+
+    def __init__(self):
+        self._store_table = []          # 고유 상가명
+        self._store_index = {}          # 상가명 → 코드
+        self._store_codes = array('I')  # 행별 상가명 코드
+        self._businesses = []
+        self._amounts = array('q')      # 행별 금액 (정수)
+        self._amount_str_table = []          # 고유 금액 문자열
+        self._amount_str_index = {}          # 금액 문자열 → 코드
+        self._amount_str_codes = array('I')  # 행별 금액 문자열 코드
+        self._amount_code_cache = {}         # 정수 금액 → 금액 문자열 코드
+        self._raw_amounts = {}          # 정수로 표현할 수 없는 금액 (행 번호 → 원래 값)
+
+    def append(self, store_name, business_name, amount):
+        """레코드 한 건 추가"""
+        code = self._store_index.get(store_name)
+        if code is None:
+            code = len(self._store_table)
+            self._store_table.append(store_name)
+            self._store_index[store_name] = code
+        self._store_codes.append(code)
+        self._businesses.append(business_name)
+
+        value = _as_int_amount(amount)
+        if value is None:
+            self._raw_amounts[len(self._amounts)] = amount
+            self._amounts.append(0)
+            self._amount_str_codes.append(self._amount_str_code(format_amount(amount)))
+            return
+
+        self._amounts.append(value)
+        code = self._amount_code_cache.get(value)
+        if code is None:
+            code = self._amount_str_code(format_amount(value))
+            self._amount_code_cache[value] = code
+        self._amount_str_codes.append(code)
+
+    def _amount_str_code(self, amount_str):
+        code = self._amount_str_index.get(amount_str)
+        if code is None:
+            code = len(self._amount_str_table)
+            self._amount_str_table.append(amount_str)
+            self._amount_str_index[amount_str] = code
+        return code
+
+    def __len__(self):
+        return len(self._store_codes)
+
+    def __iter__(self):
+        """(상가명, 상호, 금액문자열) 순으로 반복"""
+        return zip(
+            map(self._store_table.__getitem__, self._store_codes),
+            self._businesses,
+            map(self._amount_str_table.__getitem__, self._amount_str_codes),
+        )
+
+    def store_names(self):
+        return map(self._store_table.__getitem__, self._store_codes)
+
+    def business_names(self):
+        return iter(self._businesses)
+
+    def amounts(self):
+        """원래 금액 값 (정수가 아닌 금액은 입력값 그대로)"""
+        if not self._raw_amounts:
+            return iter(self._amounts)
+        raw = self._raw_amounts
+        return (raw.get(i, value) for i, value in enumerate(self._amounts))
+
+    def amount_at(self, index):
+        return self._raw_amounts.get(index, self._amounts[index])
+
+    def iter_values(self):
+        """(상가명, 상호, 금액) 원래 값 순으로 반복 (엑셀 출력용)"""
+        return zip(self.store_names(), self._businesses, self.amounts())
+
+    def to_dataframe(self, limit=None):
+        """미리보기용 DataFrame 생성"""
+        stop = len(self) if limit is None else min(limit, len(self))
+        stores = [self._store_table[code] for code in self._store_codes[:stop]]
+        amounts = [self.amount_at(i) for i in range(stop)]
+        return pd.DataFrame({
+            RECORD_COLUMNS[0]: stores,
+            RECORD_COLUMNS[1]: self._businesses[:stop],
+            RECORD_COLUMNS[2]: amounts,
+        })
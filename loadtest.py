@@ -0,0 +1,90 @@
+"""봉투 API 부하 테스트
+
+로컬에서 실행 중인 server.py 에 같은 엑셀 파일을 동시에 여러 번 보내고
+지연 시간 분포, 처리량, 상태 코드별 건수를 출력합니다.
+
+    python server.py --port 8080 &
+    python loadtest.py --url http://127.0.0.1:8080 --requests 100 --concurrency 8
+"""
+import argparse
+import os
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def send(url, body):
+    """요청 한 건 → (상태 코드, 지연 시간 초, 응답 크기)"""
+    request = urllib.request.Request(url, data=body, method="POST", headers={
+        "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    })
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            size = len(response.read())
+            status = response.status
+    except urllib.error.HTTPError as e:
+        size = len(e.read())
+        status = e.code
+    except OSError:
+        size = 0
+        status = 0  # 연결 실패
+    return status, time.perf_counter() - started, size
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="봉투 API 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--file", default=os.path.join(base_dir, "5.xlsx"), help="업로드할 엑셀 파일")
+    parser.add_argument("--format", choices=("pdf", "xlsx"), default="pdf")
+    parser.add_argument("--requests", type=int, default=50, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    args = parser.parse_args()
+
+    with open(args.file, "rb") as f:
+        body = f.read()
+
+    endpoint = "/envelopes.pdf" if args.format == "pdf" else "/sorted.xlsx"
+    url = args.url.rstrip("/") + endpoint
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(lambda _: send(url, body), range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for status, _, _ in results)
+    latencies = sorted(latency for status, latency, _ in results if status == 200)
+
+    print(f"요청 {args.requests}건, 동시 {args.concurrency}, {url}")
+    print(f"소요 {elapsed:.2f}초, 처리량 {len(latencies) / elapsed:.2f}건/초 (성공 기준)")
+    print("상태 코드: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+    if latencies:
+        print(f"지연(ms): p50={percentile(latencies, 50) * 1000:.1f} "
+              f"p90={percentile(latencies, 90) * 1000:.1f} "
+              f"p99={percentile(latencies, 99) * 1000:.1f} "
+              f"max={latencies[-1] * 1000:.1f}")
+
+    # 서버 지표 요약
+    try:
+        with urllib.request.urlopen(args.url.rstrip("/") + "/metrics") as response:
+            metrics = response.read().decode("utf-8")
+    except OSError:
+        return
+    for line in metrics.splitlines():
+        if line.startswith(("envelope_jobs_rejected_total", "envelope_queue_depth", "envelope_records_total")):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""봉투 PDF 비교 도구
+
+두 PDF 의 글꼴 이름과 페이지 내용 스트림(그리기 명령)을 풀어서 비교합니다.
+페이지가 그리는 XObject 도 따라가서, 폼은 그 내용 스트림을 (재귀적으로)
+펼쳐 넣고 이미지는 데이터 해시로 비교합니다.
+reproducible 모드로 만든 PDF 를 기준 파일(golden)로 저장해 두고,
+최적화 후 출력이 바뀌지 않았는지 확인할 때 사용합니다.
+
+    python pdf_diff.py golden.pdf envelopes.pdf
+
+내용 스트림이 모두 같으면 종료 코드 0, 다르면 1 을 돌려주고
+처음 다른 페이지의 차이를 보여 줍니다.
+"""
+import argparse
+import base64
+import difflib
+import hashlib
+import re
+import sys
+import zlib
+
+OBJ_RE = re.compile(rb'(\d+) 0 obj\s*(.*?)\s*endobj', re.S)
+STREAM_RE = re.compile(rb'<<(.*?)>>\s*stream\r?\n(.*?)endstream', re.S)
+FILTER_RE = re.compile(rb'/Filter\s*(\[[^\]]*\]|/\w+)')
+REF_RE = re.compile(rb'(\d+) 0 R')
+NAMED_REF_RE = re.compile(rb'/([^\s/<>\[\]()]+)\s+(\d+) 0 R')
+
+# 비교 결과로 보여 줄 최대 차이 줄 수
+MAX_DIFF_LINES = 40
+
+
+def read_objects(data):
+    """PDF 바이트 → {객체 번호: 객체 본문}"""
+    return {int(num): body for num, body in OBJ_RE.findall(data)}
+
+
+def decode_stream(body):
+    """스트림 객체 본문 → 필터를 푼 바이트"""
+    match = STREAM_RE.match(body)
+    if match is None:
+        return b''
+    header, data = match.groups()
+
+    filter_match = FILTER_RE.search(header)
+    filters = re.findall(rb'/(\w+)', filter_match.group(1)) if filter_match else []
+    for name in filters:
+        if name == b'ASCII85Decode':
+            data = data.strip()
+            if data.endswith(b'~>'):
+                data = data[:-2]
+            data = base64.a85decode(data)
+        elif name == b'FlateDecode':
+            data = zlib.decompress(data)
+        else:
+            break
+    return data
+
+
+def _balanced_dict(data, start):
+    """data[start:] 가 '<<' 로 시작할 때 짝이 맞는 '>>' 까지"""
+    depth = 0
+    i = start
+    while i < len(data):
+        if data.startswith(b'<<', i):
+            depth += 1
+            i += 2
+        elif data.startswith(b'>>', i):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return data[start:i]
+        else:
+            i += 1
+    return data[start:]
+
+
+def dict_entry(objects, body, key):
+    """사전 본문에서 key 의 사전 값 (간접 참조는 따라감, 없으면 b'')"""
+    match = re.search(rb'/' + key + rb'\s*(<<|\d+ 0 R)', body)
+    if match is None:
+        return b''
+    if match.group(1) == b'<<':
+        return _balanced_dict(body, match.start(1))
+    return objects.get(int(match.group(1).split()[0]), b'')
+
+
+def expand_xobjects(objects, content, resources, seen=frozenset()):
+    """내용 스트림 뒤에 리소스의 XObject 를 이름 순으로 붙임
+
+    폼은 내용 스트림과 그 폼의 XObject 를 재귀적으로 펼치고,
+    이미지는 스트림 데이터의 SHA-256 으로 나타냅니다.
+    """
+    parts = [content]
+    xobjects = dict_entry(objects, resources, b'XObject')
+    for name, ref in sorted(NAMED_REF_RE.findall(xobjects)):
+        num = int(ref)
+        match = STREAM_RE.match(objects.get(num, b''))
+        header, data = match.groups() if match else (b'', b'')
+
+        if b'/Subtype /Image' in header:
+            digest = hashlib.sha256(data).hexdigest().encode()
+            parts.append(b'% XObject /' + name + b' image sha256=' + digest)
+        elif num in seen:
+            parts.append(b'% XObject /' + name + b' form (recursive)')
+        else:
+            parts.append(b'% XObject /' + name + b' form')
+            parts.append(expand_xobjects(
+                objects, decode_stream(objects[num]),
+                dict_entry(objects, header, b'Resources'), seen | {num},
+            ))
+    return b'\n'.join(parts)
+
+
+def page_contents(data):
+    """페이지 순서대로 내용 스트림 목록 (XObject 펼침 포함)"""
+    objects = read_objects(data)
+
+    # 최상위 /Pages (부모가 없는 페이지 트리)
+    root = next(
+        num for num, body in objects.items()
+        if re.search(rb'/Type /Pages\b', body) and b'/Parent' not in body
+    )
+
+    contents = []
+
+    def walk(num):
+        body = objects[num]
+        if re.search(rb'/Type /Pages\b', body):
+            kids = re.search(rb'/Kids\s*\[([^\]]*)\]', body).group(1)
+            for kid in REF_RE.findall(kids):
+                walk(int(kid))
+            return
+
+        # 페이지: /Contents 는 참조 하나 또는 참조 배열
+        match = re.search(rb'/Contents\s*(\[[^\]]*\]|\d+ 0 R)', body)
+        refs = REF_RE.findall(match.group(1)) if match else []
+        content = b''.join(decode_stream(objects[int(ref)]) for ref in refs)
+        contents.append(expand_xobjects(objects, content, dict_entry(objects, body, b'Resources')))
+
+    walk(root)
+    return contents
+
+
+def font_names(data):
+    """문서의 글꼴 이름 목록 (TrueType 서브셋은 'AAAAAA+이름' 형식)"""
+    names = set()
+    for body in read_objects(data).values():
+        if not re.search(rb'/Type /Font\b', body):
+            continue
+        match = re.search(rb'/BaseFont /(\S+)', body)
+        if match:
+            names.add(match.group(1).decode('latin1'))
+    return sorted(names)
+
+
+def compare(path_a, path_b, out=sys.stdout):
+    """두 PDF 비교 → 내용 스트림이 모두 같으면 True"""
+    with open(path_a, 'rb') as f:
+        data_a = f.read()
+    with open(path_b, 'rb') as f:
+        data_b = f.read()
+
+    if data_a == data_b:
+        print("✅ 두 파일이 바이트 단위로 같습니다.", file=out)
+        return True
+
+    fonts_a = font_names(data_a)
+    fonts_b = font_names(data_b)
+    if fonts_a != fonts_b:
+        print(f"❌ 글꼴이 다릅니다: {', '.join(fonts_a)} / {', '.join(fonts_b)}", file=out)
+        return False
+
+    pages_a = page_contents(data_a)
+    pages_b = page_contents(data_b)
+
+    if len(pages_a) != len(pages_b):
+        print(f"❌ 페이지 수가 다릅니다: {len(pages_a)} / {len(pages_b)}", file=out)
+        return False
+
+    different = [i for i, (a, b) in enumerate(zip(pages_a, pages_b)) if a != b]
+    if not different:
+        print(f"✅ 페이지 {len(pages_a)}개의 내용 스트림(XObject 포함)이 모두 같습니다 "
+              f"(메타데이터/리소스만 다름).", file=out)
+        return True
+
+    print(f"❌ 내용이 다른 페이지 {len(different)}개: "
+          + ", ".join(str(i + 1) for i in different[:20])
+          + (" ..." if len(different) > 20 else ""), file=out)
+
+    first = different[0]
+    diff = difflib.unified_diff(
+        pages_a[first].decode('latin1').splitlines(),
+        pages_b[first].decode('latin1').splitlines(),
+        fromfile=f"{path_a} (페이지 {first + 1})",
+        tofile=f"{path_b} (페이지 {first + 1})",
+        lineterm='',
+    )
+    for i, line in enumerate(diff):
+        if i >= MAX_DIFF_LINES:
+            print("...", file=out)
+            break
+        print(line, file=out)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="봉투 PDF 내용 스트림 비교")
+    parser.add_argument("golden", help="기준 PDF")
+    parser.add_argument("candidate", help="비교할 PDF")
+    args = parser.parse_args()
+
+    sys.exit(0 if compare(args.golden, args.candidate) else 1)
+
+
+if __name__ == "__main__":
+    main()
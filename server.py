@@ -0,0 +1,609 @@
+"""봉투 생성 HTTP API
+
+Streamlit 화면과 같은 정렬/PDF 파이프라인(envelope_pipeline)을 HTTP 로 제공합니다.
+폰트, 로고, number.xlsm 을 미리 읽어 둔 작업 프로세스 풀에서 처리하며,
+동시 작업 수와 대기열 길이를 제한합니다.
+
+    python server.py --port 8080 --workers 2 --queue 8
+
+요청
+    POST /envelopes.pdf   → 봉투 PDF
+    POST /sorted.xlsx     → 정렬된 엑셀
+        본문: 엑셀 파일 (5.xlsx 형식) 또는 JSON
+            {"rows": [{"상가명": "...", "상호": "...", "금액": 1000}, ...],
+             "extra_text": "감사합니다", "text_size": 12, "text_color": "#000000"}
+        엑셀 본문일 때 추가 텍스트 설정은 쿼리 문자열로 전달
+            (?extra_text=...&text_size=12&text_color=%23000000)
+        reproducible=1 (JSON 은 "reproducible": true) 이면 같은 입력에 대해
+        항상 같은 PDF/엑셀 바이트를 돌려줍니다. 응답의 ETag 는 내용 해시이며,
+        If-None-Match 가 같으면 (POST 이므로 304 대신) 412 로 응답합니다.
+    GET /metrics          → Prometheus 텍스트 형식 지표
+    GET /healthz          → 작업 프로세스 풀 상태 (사용 불가면 503)
+"""
+import argparse
+import hashlib
+import io
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+
+import envelope_pipeline
+from envelope_pipeline import EnvelopeDataError, KOREAN_FONT_NAME, FALLBACK_FONT_NAME
+
+PDF_MIME = "application/pdf"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 경로 → (출력 형식, 파일명, MIME)
+OUTPUTS = {
+    "/envelopes.pdf": ("pdf", "envelopes.pdf", PDF_MIME),
+    "/sorted.xlsx": ("xlsx", "sorted_data.xlsx", XLSX_MIME),
+}
+
+# 추가 텍스트 글씨 크기 범위 (웹앱 슬라이더와 동일)
+TEXT_SIZE_RANGE = (8, 30)
+
+# 응답 전송 단위
+CHUNK_SIZE = 64 * 1024
+
+# JSON 행 값으로 받는 타입 (객체/배열은 셀 값이 될 수 없음)
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# 참으로 보는 쿼리 문자열 값
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+RESTARTING_MESSAGE = "작업 프로세스를 다시 시작하는 중입니다. 잠시 후 다시 시도하세요."
+
+
+# ---------------------------------------------------------------------------
+# 작업 프로세스
+# ---------------------------------------------------------------------------
+
+# 작업 프로세스마다 한 번 준비해 두는 자원
+_worker = {}
+
+
+def _init_worker():
+    """작업 프로세스 초기화: 폰트 등록, 로고/number.xlsm 로드"""
+    font_available, _ = envelope_pipeline.register_font()
+    _worker["font_name"] = KOREAN_FONT_NAME if font_available else FALLBACK_FONT_NAME
+
+    logo = envelope_pipeline.load_logo()
+    if logo is not None:
+        # 이미지 디코딩도 미리 해 둠
+        logo.getRGBData()
+    _worker["logo"] = logo
+
+    try:
+        _worker["df_number"] = envelope_pipeline.load_number_table()
+        _worker["number_error"] = None
+    except EnvelopeDataError as e:
+        _worker["df_number"] = None
+        _worker["number_error"] = str(e)
+
+
+def _warm_up():
+    """풀 예열용 빈 작업"""
+    return _worker["font_name"]
+
+
+def _run_job(output_format, rows, workbook, options):
+    """정렬 후 PDF/엑셀 생성 → (파일 내용, 레코드 수, 무결성 불일치 수)"""
+    if _worker["df_number"] is None:
+        raise EnvelopeDataError(_worker["number_error"])
+
+    if rows is not None:
+        uploaded_df = pd.DataFrame(rows)
+    else:
+        try:
+            uploaded_df = pd.read_excel(io.BytesIO(workbook))
+        except Exception as e:
+            raise EnvelopeDataError(f"❌ 엑셀 파일을 읽을 수 없습니다: {e}")
+
+    records, mismatches = envelope_pipeline.sort_records(uploaded_df, _worker["df_number"])
+
+    output = io.BytesIO()
+    if output_format == "pdf":
+        envelope_pipeline.render_envelopes_pdf(
+            records, output,
+            font_name=_worker["font_name"],
+            logo=_worker["logo"],
+            **options
+        )
+    else:
+        envelope_pipeline.write_sorted_excel(
+            records, output, reproducible=options.get("reproducible", False)
+        )
+
+    return output.getvalue(), len(records), len(mismatches)
+
+
+# ---------------------------------------------------------------------------
+# 지표
+# ---------------------------------------------------------------------------
+
+class Metrics:
+    """Prometheus 텍스트 형식 지표"""
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, workers, max_pending):
+        self._lock = threading.Lock()
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.abandoned = 0       # 시간 초과됐지만 아직 작업 프로세스에서 실행 중인 작업
+        self.timed_out_total = 0
+        self.pool_restarts_total = 0
+        self.requests = {}       # (endpoint, status) → 건수
+        self.latency = {}        # endpoint → [버킷별 건수..., 합계, 건수]
+        self.records_total = 0
+        self.rejected_total = 0
+
+    def job_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def job_finished(self, records=0, abandoned=False):
+        with self._lock:
+            self.in_flight -= 1
+            self.records_total += records
+            if abandoned:
+                self.abandoned -= 1
+
+    def job_timed_out(self):
+        with self._lock:
+            self.timed_out_total += 1
+            self.abandoned += 1
+
+    def pool_restarted(self):
+        with self._lock:
+            self.pool_restarts_total += 1
+
+    def rejected(self):
+        with self._lock:
+            self.rejected_total += 1
+
+    def observe(self, endpoint, status, seconds):
+        with self._lock:
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            hist = self.latency.get(endpoint)
+            if hist is None:
+                hist = self.latency[endpoint] = [0] * len(self.LATENCY_BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(self.LATENCY_BUCKETS):
+                if seconds <= bound:
+                    hist[i] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+
+    def render(self):
+        with self._lock:
+            running = min(self.in_flight, self.workers)
+            lines = [
+                "# HELP envelope_workers Number of warm worker processes.",
+                "# TYPE envelope_workers gauge",
+                f"envelope_workers {self.workers}",
+                "# HELP envelope_jobs_in_flight Jobs admitted and not yet finished.",
+                "# TYPE envelope_jobs_in_flight gauge",
+                f"envelope_jobs_in_flight {self.in_flight}",
+                "# HELP envelope_queue_depth Admitted jobs waiting for a free worker.",
+                "# TYPE envelope_queue_depth gauge",
+                f"envelope_queue_depth {self.in_flight - running}",
+                "# HELP envelope_jobs_abandoned Timed-out jobs still occupying a worker.",
+                "# TYPE envelope_jobs_abandoned gauge",
+                f"envelope_jobs_abandoned {self.abandoned}",
+                "# HELP envelope_jobs_timed_out_total Running jobs that exceeded the job timeout.",
+                "# TYPE envelope_jobs_timed_out_total counter",
+                f"envelope_jobs_timed_out_total {self.timed_out_total}",
+                "# HELP envelope_pool_restarts_total Worker pool replacements.",
+                "# TYPE envelope_pool_restarts_total counter",
+                f"envelope_pool_restarts_total {self.pool_restarts_total}",
+                "# HELP envelope_queue_capacity Maximum jobs admitted at once.",
+                "# TYPE envelope_queue_capacity gauge",
+                f"envelope_queue_capacity {self.max_pending}",
+                "# HELP envelope_jobs_rejected_total Jobs rejected because the queue was full.",
+                "# TYPE envelope_jobs_rejected_total counter",
+                f"envelope_jobs_rejected_total {self.rejected_total}",
+                "# HELP envelope_records_total Envelope records processed.",
+                "# TYPE envelope_records_total counter",
+                f"envelope_records_total {self.records_total}",
+                "# HELP envelope_requests_total HTTP requests by endpoint and status.",
+                "# TYPE envelope_requests_total counter",
+            ]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'envelope_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+
+            lines.append("# HELP envelope_request_duration_seconds HTTP request latency.")
+            lines.append("# TYPE envelope_request_duration_seconds histogram")
+            for endpoint, hist in sorted(self.latency.items()):
+                for bound, count in zip(self.LATENCY_BUCKETS, hist):
+                    lines.append(
+                        f'envelope_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'envelope_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {hist[-1]}'
+                )
+                lines.append(f'envelope_request_duration_seconds_sum{{endpoint="{endpoint}"}} {hist[-2]:.6f}')
+                lines.append(f'envelope_request_duration_seconds_count{{endpoint="{endpoint}"}} {hist[-1]}')
+
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# HTTP 서버
+# ---------------------------------------------------------------------------
+
+class RequestError(Exception):
+    """HTTP 오류 응답으로 돌려줄 요청 오류"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더가 etag 와 맞는지 (약한 비교, '*' 는 모두 일치)"""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def parse_text_color(value):
+    """'#RRGGBB' → (r, g, b) 0~1 범위"""
+    hex_value = str(value).lstrip('#')
+    if len(hex_value) != 6:
+        raise RequestError(400, f"text_color 형식이 올바르지 않습니다: {value}")
+    try:
+        return tuple(int(hex_value[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+    except ValueError:
+        raise RequestError(400, f"text_color 형식이 올바르지 않습니다: {value}")
+
+
+def parse_options(source):
+    """추가 텍스트 설정 (JSON 객체 또는 쿼리 문자열 dict)"""
+    options = {}
+    if source.get("extra_text"):
+        options["extra_text"] = str(source["extra_text"])
+    if source.get("text_size") is not None:
+        try:
+            text_size = int(source["text_size"])
+        except (TypeError, ValueError):
+            raise RequestError(400, "text_size 는 정수여야 합니다.")
+        if not TEXT_SIZE_RANGE[0] <= text_size <= TEXT_SIZE_RANGE[1]:
+            raise RequestError(400, f"text_size 는 {TEXT_SIZE_RANGE[0]}~{TEXT_SIZE_RANGE[1]} 사이여야 합니다.")
+        options["text_size"] = text_size
+    if source.get("text_color"):
+        options["text_color"] = parse_text_color(source["text_color"])
+    if source.get("reproducible") is not None:
+        value = source["reproducible"]
+        options["reproducible"] = value is True or str(value).lower() in TRUE_VALUES
+    return options
+
+
+class EnvelopeServer(ThreadingHTTPServer):
+    """작업 프로세스 풀과 대기열 제한을 가진 HTTP 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address, workers=2, queue_size=8, max_body=20 * 1024 * 1024,
+                 job_timeout=120.0):
+        self.workers = workers
+        self.max_body = max_body
+        self.job_timeout = job_timeout
+        self.metrics = Metrics(workers, workers + queue_size)
+
+        # 실행 중 + 대기 중인 작업 수 제한 (가득 차면 503)
+        # 자리는 작업이 작업 프로세스에서 실제로 끝날 때 반환됨
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+        # 시간 초과 후에도 작업 프로세스를 점유하고 있는 작업
+        self._abandoned = set()
+        self._abandoned_lock = threading.Lock()
+
+        # 풀 교체 중에는 새 풀 예열이 끝날 때까지 _restarting 이 True (잠금은 교체 순간에만)
+        self._pool_lock = threading.Lock()
+        self._restarting = False
+        self.pool, self.font_name = self._new_pool()
+
+        super().__init__(address, EnvelopeRequestHandler)
+
+    def _new_pool(self):
+        """작업 프로세스 풀을 새로 만들고 예열 → (풀, 폰트 이름)"""
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        try:
+            return pool, self.warm_up(pool)
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def _replace_pool(self, old_pool, kill=False):
+        """old_pool 이 아직 현재 풀이면 새 풀로 교체
+
+        kill=True 이면 실행 중인 작업 프로세스를 강제로 종료합니다. 남아 있던
+        작업은 BrokenProcessPool 로 끝나므로 대기열 자리도 함께 반환됩니다.
+        새 풀은 잠금 밖에서 만들고 예열하므로 그동안 /healthz 와 다른 요청은
+        기다리지 않고 바로 unavailable / 503 을 받습니다.
+        """
+        with self._pool_lock:
+            if self.pool is not old_pool or self._restarting:
+                return
+            self._restarting = True
+
+        try:
+            if kill:
+                # Python 3.11 ProcessPoolExecutor 에는 작업 프로세스 종료 API 가 없음
+                for process in list((old_pool._processes or {}).values()):
+                    process.terminate()
+            old_pool.shutdown(wait=False, cancel_futures=True)
+            new_pool, font_name = self._new_pool()
+            with self._pool_lock:
+                self.pool, self.font_name = new_pool, font_name
+        finally:
+            with self._pool_lock:
+                self._restarting = False
+        self.metrics.pool_restarted()
+
+    def warm_up(self, pool):
+        """모든 작업 프로세스를 미리 띄워 초기화까지 마침
+
+        작업 프로세스는 첫 제출 때 생성되고 initializer 가 끝나야 작업을 받으므로,
+        작업 프로세스 수만큼 빈 작업을 보내고 기다립니다.
+        """
+        futures = [pool.submit(_warm_up) for _ in range(self.workers)]
+        return [future.result() for future in futures][0]
+
+    def submit(self, output_format, rows, workbook, options):
+        """대기열 자리가 있으면 작업 제출, 없으면 RequestError(503)"""
+        if not self.slots.acquire(blocking=False):
+            self.metrics.rejected()
+            raise RequestError(503, "처리 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+
+        self.metrics.job_started()
+        try:
+            pool, future = self._submit_job(output_format, rows, workbook, options)
+        except BaseException:
+            self.metrics.job_finished()
+            self.slots.release()
+            raise
+        future.add_done_callback(self._job_done)
+
+        try:
+            return future.result(timeout=self.job_timeout)
+        except FutureTimeoutError:
+            self._abandon(pool, future)
+            raise RequestError(504, "작업 시간이 초과되었습니다.")
+        except EnvelopeDataError as e:
+            raise RequestError(422, str(e))
+        except BrokenProcessPool:
+            # 작업 중 작업 프로세스가 죽음 (메모리 부족, 확장 모듈 오류 등)
+            self._replace_pool(pool)
+            raise RequestError(503, "작업 프로세스가 비정상 종료되어 다시 시작했습니다. 잠시 후 다시 시도하세요.")
+
+    def _current_pool(self):
+        """현재 풀 (교체 중이면 RequestError(503))"""
+        with self._pool_lock:
+            if self._restarting:
+                raise RequestError(503, RESTARTING_MESSAGE)
+            return self.pool
+
+    def _submit_job(self, *args):
+        """현재 풀에 작업 제출 → (풀, future). 풀이 망가져 있으면 새로 만든 뒤 제출"""
+        pool = self._current_pool()
+        try:
+            return pool, pool.submit(_run_job, *args)
+        except (BrokenProcessPool, RuntimeError):
+            # 망가진 풀 또는 다른 요청이 교체하느라 이미 종료한 풀
+            pass
+        self._replace_pool(pool)
+        pool = self._current_pool()
+        try:
+            return pool, pool.submit(_run_job, *args)
+        except (BrokenProcessPool, RuntimeError):
+            raise RequestError(503, RESTARTING_MESSAGE)
+
+    def pool_status(self):
+        """풀 상태: ok / degraded (버려진 작업이 작업 프로세스 점유) / unavailable"""
+        with self._pool_lock:
+            pool = self.pool
+            restarting = self._restarting
+        # Python 3.11 ProcessPoolExecutor 에는 상태 조회 API 가 없음
+        broken = bool(getattr(pool, "_broken", False))
+        processes = getattr(pool, "_processes", None) or {}
+        alive = sum(1 for process in processes.values() if process.is_alive())
+        with self._abandoned_lock:
+            abandoned = len(self._abandoned)
+
+        if restarting or broken or alive < self.workers:
+            status = "unavailable"
+        elif abandoned:
+            status = "degraded"
+        else:
+            status = "ok"
+        return {
+            "status": status,
+            "workers": self.workers,
+            "workers_alive": alive,
+            "restarting": restarting,
+            "jobs_abandoned": abandoned,
+            "font": self.font_name,
+        }
+
+    def _job_done(self, future):
+        """작업이 실제로 끝났을 때 (성공/실패/취소) 대기열 자리 반환"""
+        records = 0
+        if not future.cancelled() and future.exception() is None:
+            records = future.result()[1]
+        with self._abandoned_lock:
+            abandoned = future in self._abandoned
+            self._abandoned.discard(future)
+            self.metrics.job_finished(records, abandoned)
+        self.slots.release()
+
+    def _abandon(self, pool, future):
+        """시간 초과된 작업 처리
+
+        아직 시작하지 않은 작업은 취소합니다. 이미 실행 중이면 작업 프로세스를
+        계속 점유하므로 자리를 그대로 둔 채 버려진 작업으로 집계하고, 모든 작업
+        프로세스가 버려진 작업에 묶이면 풀을 강제로 교체합니다.
+        """
+        if future.cancel():
+            return
+        with self._abandoned_lock:
+            if future.done():
+                return
+            self._abandoned.add(future)
+            self.metrics.job_timed_out()
+            stuck = len(self._abandoned)
+        if stuck >= self.workers:
+            self._replace_pool(pool, kill=True)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class EnvelopeRequestHandler(BaseHTTPRequestHandler):
+    server_version = "EnvelopeServer/1.0"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self.send_body(200, self.server.metrics.render().encode("utf-8"),
+                           "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/healthz":
+            status = self.server.pool_status()
+            self.send_json(503 if status["status"] == "unavailable" else 200, status)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        output = OUTPUTS.get(url.path)
+        if output is None:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        started = time.perf_counter()
+        status = 500
+        try:
+            output_format, filename, mime = output
+            rows, workbook, options = self.read_job(parse_qs(url.query))
+            content, records, mismatches = self.server.submit(output_format, rows, workbook, options)
+
+            # 내용 해시 ETag (reproducible 출력이면 같은 입력 → 같은 ETag)
+            # POST 의 If-None-Match 가 맞으면 304 가 아니라 412 (RFC 9110 §13.1.2)
+            etag = '"' + hashlib.sha256(content).hexdigest() + '"'
+            if etag_matches(self.headers.get("If-None-Match", ""), etag):
+                raise RequestError(412, "If-None-Match 와 같은 결과입니다 (변경 없음).",
+                                   {"ETag": etag})
+
+            status = 200
+            self.send_body(200, content, mime, {
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "ETag": etag,
+                "X-Envelope-Records": str(records),
+                "X-Envelope-Mismatches": str(mismatches),
+            })
+        except RequestError as e:
+            status = e.status
+            headers = dict(e.headers)
+            if e.status == 503:
+                headers["Retry-After"] = "1"
+            self.send_json(e.status, {"error": str(e)}, headers)
+        except Exception as e:
+            self.send_json(500, {"error": f"❌ 오류가 발생했습니다: {e}"})
+        finally:
+            self.server.metrics.observe(url.path, status, time.perf_counter() - started)
+
+    def read_job(self, query):
+        """요청 본문 → (JSON 행 또는 None, 엑셀 바이트 또는 None, 추가 텍스트 설정)"""
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            raise RequestError(411, "Content-Length 가 필요합니다.")
+        if length <= 0:
+            raise RequestError(400, "요청 본문이 비어 있습니다.")
+        if length > self.server.max_body:
+            raise RequestError(413, f"요청 본문이 너무 큽니다 (최대 {self.server.max_body} bytes).")
+        body = self.rfile.read(length)
+
+        content_type = self.headers.get("Content-Type", "")
+        if "json" not in content_type:
+            options = parse_options({key: values[-1] for key, values in query.items()})
+            return None, body, options
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise RequestError(400, "JSON 형식이 올바르지 않습니다.")
+        if isinstance(payload, list):
+            payload = {"rows": payload}
+        rows = payload.get("rows") if isinstance(payload, dict) else None
+        if not rows or not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise RequestError(400, "'rows' 는 비어 있지 않은 객체 목록이어야 합니다.")
+        for index, row in enumerate(rows, start=1):
+            for key, value in row.items():
+                if not isinstance(value, SCALAR_TYPES):
+                    raise RequestError(
+                        400, f"rows[{index}] 의 '{key}' 값은 문자열/숫자/null 이어야 합니다."
+                    )
+        return rows, None, parse_options(payload)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_body(status, body, "application/json; charset=utf-8", headers)
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+        view = memoryview(body)
+        for start in range(0, len(view), CHUNK_SIZE):
+            self.wfile.write(view[start:start + CHUNK_SIZE])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="봉투 생성 HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2, help="작업 프로세스 수 (동시 작업 수)")
+    parser.add_argument("--queue", type=int, default=8, help="작업 프로세스를 기다릴 수 있는 요청 수")
+    parser.add_argument("--max-body", type=int, default=20 * 1024 * 1024, help="최대 요청 본문 크기 (bytes)")
+    parser.add_argument("--job-timeout", type=float, default=120.0, help="작업 제한 시간 (초)")
+    args = parser.parse_args()
+
+    server = EnvelopeServer(
+        (args.host, args.port),
+        workers=args.workers,
+        queue_size=args.queue,
+        max_body=args.max_body,
+        job_timeout=args.job_timeout,
+    )
+    print(f"✅ 봉투 API 시작: http://{args.host}:{args.port} "
+          f"(작업 프로세스 {args.workers}개, 대기열 {args.queue}, 폰트 {server.font_name})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
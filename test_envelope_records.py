@@ -0,0 +1,157 @@
+"""봉투 레코드 저장소 (envelope_records.py) 테스트
+
+EnvelopeRecords 는 정렬 결과 DataFrame 을 대신하므로, 반복 순서와 금액 값,
+출력용 금액 문자열이 기존 방식(DataFrame + iterrows)과 같은지 확인합니다.
+golden/sorted_5.tsv 는 기존 app.sort_data_by_number_file 로 5.xlsx 를 정렬한 결과와
+기존 PDF 코드가 만든 금액 문자열입니다.
+"""
+import csv
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import envelope_pipeline
+from envelope_records import EnvelopeRecords, RECORD_COLUMNS, format_amount
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+input_path = os.path.join(base_dir, "5.xlsx")
+baseline_path = os.path.join(base_dir, "golden", "sorted_5.tsv")
+
+
+def make_records(rows):
+    records = EnvelopeRecords()
+    for row in rows:
+        records.append(*row)
+    return records
+
+
+def old_amount_str(amount):
+    """기존 PDF 코드의 금액 포맷 (iterrows 로 꺼낸 값 기준)"""
+    if isinstance(amount, (int, float)):
+        return f"{amount:,.0f}원"
+    return str(amount)
+
+
+def test_append_keeps_order_and_iterates_formatted_rows():
+    records = make_records([
+        ("1거리", "엠버", 541000),
+        ("1상가", "다른", 93000),
+        ("1거리", "씨티모자", 541000),
+    ])
+
+    assert len(records) == 3
+    assert list(records) == [
+        ("1거리", "엠버", "541,000원"),
+        ("1상가", "다른", "93,000원"),
+        ("1거리", "씨티모자", "541,000원"),
+    ]
+    assert list(records.store_names()) == ["1거리", "1상가", "1거리"]
+    assert list(records.business_names()) == ["엠버", "다른", "씨티모자"]
+    assert list(records.iter_values()) == [
+        ("1거리", "엠버", 541000),
+        ("1상가", "다른", 93000),
+        ("1거리", "씨티모자", 541000),
+    ]
+
+
+def test_integral_floats_are_stored_as_int():
+    records = make_records([("거리", "엠버", 541000.0), ("거리", "다른", np.float64(93000))])
+
+    amounts = list(records.amounts())
+    assert amounts == [541000, 93000]
+    assert all(type(amount) is int for amount in amounts)
+    assert [amount_str for _, _, amount_str in records] == ["541,000원", "93,000원"]
+
+
+def test_raw_amounts_are_kept_as_given():
+    big = 2 ** 70
+    rows = [
+        ("거리", "정수", 1000),
+        ("거리", "소수", 1234.5),
+        ("거리", "빈값", float("nan")),
+        ("거리", "큰값", big),
+        ("거리", "문자", "미정"),
+        ("거리", "없음", None),
+        ("거리", "정수2", np.int64(2000)),
+    ]
+    records = make_records(rows)
+
+    amounts = list(records.amounts())
+    assert amounts[0] == 1000
+    assert amounts[1] == 1234.5
+    assert math.isnan(amounts[2])
+    assert amounts[3] == big
+    assert amounts[4] == "미정"
+    assert amounts[5] is None
+    assert amounts[6] == 2000 and type(amounts[6]) is int
+
+    for index, amount in enumerate(amounts):
+        at = records.amount_at(index)
+        assert at is amount or at == amount or (math.isnan(at) and math.isnan(amount))
+
+    assert [amount_str for _, _, amount_str in records] == [
+        "1,000원", "1,234원", "nan원", f"{big:,}원", "미정", "None", "2,000원",
+    ]
+
+
+def test_to_dataframe_limit():
+    records = make_records([
+        ("거리", "엠버", 541000),
+        ("거리", "소수", 1.5),
+        ("상가", "다른", 93000),
+    ])
+
+    df = records.to_dataframe()
+    assert list(df.columns) == list(RECORD_COLUMNS)
+    assert df.values.tolist() == [["거리", "엠버", 541000], ["거리", "소수", 1.5], ["상가", "다른", 93000]]
+
+    assert records.to_dataframe(limit=2).values.tolist() == [["거리", "엠버", 541000], ["거리", "소수", 1.5]]
+    assert len(records.to_dataframe(limit=10)) == 3
+    assert records.to_dataframe(limit=0).empty
+
+
+@pytest.mark.parametrize("amounts, dtype", [
+    ([541000, 0, -1000, 2 ** 62], "int64"),
+    ([541000.0, 1234.5, float("nan"), -0.4], "float64"),
+    # None 은 iterrows 가 pandas 버전에 따라 nan 으로 바꾸므로 제외 (엑셀 빈 칸은 nan)
+    (["미정", 1000, 2.5, True], object),
+], ids=["int", "float", "object"])
+def test_format_amount_matches_old_iterrows_formatting(amounts, dtype):
+    df = pd.DataFrame({
+        RECORD_COLUMNS[0]: ["거리"] * len(amounts),
+        RECORD_COLUMNS[1]: [f"상호{i}" for i in range(len(amounts))],
+        RECORD_COLUMNS[2]: pd.Series(amounts, dtype=dtype),
+    })
+    expected = [old_amount_str(row[RECORD_COLUMNS[2]]) for _, row in df.iterrows()]
+
+    # sort_records 와 같이 컬럼 값을 zip 으로 꺼내서 추가
+    records = make_records(zip(*(df[column] for column in RECORD_COLUMNS)))
+    assert [amount_str for _, _, amount_str in records] == expected
+
+
+def test_format_amount_treats_numpy_scalars_as_numbers():
+    # 기존 코드는 numpy 정수를 str() 로 출력했음 ("541000"); 지금은 숫자로 포맷
+    assert format_amount(np.int64(541000)) == "541,000원"
+    assert format_amount(np.float64(1234.5)) == "1,234원"
+    assert format_amount("541000") == "541000"
+
+
+def test_sort_records_matches_baseline():
+    records, mismatches = envelope_pipeline.sort_records(
+        pd.read_excel(input_path), envelope_pipeline.load_number_table()
+    )
+
+    with open(baseline_path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = next(reader)
+        baseline = list(reader)
+
+    assert header == [*RECORD_COLUMNS, "금액문자열"]
+    assert mismatches == []
+    assert [
+        [store, business, str(amount), amount_str]
+        for (store, business, amount_str), amount in zip(records, records.amounts())
+    ] == baseline
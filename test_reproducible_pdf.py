@@ -0,0 +1,180 @@
+"""reproducible 모드 봉투 PDF 골든 파일 테스트
+
+5.xlsx 를 정렬해 reproducible 렌더링하고
+- 두 번 렌더링한 바이트가 같은지 (기본 폰트, 한글 TrueType 폰트),
+- 글꼴 이름과 페이지 내용 스트림(폼/이미지 XObject 포함)이 골든 파일과 같은지
+확인합니다.
+
+기본 폰트(Helvetica)는 한글을 모두 같은 대체 글리프로 그리고, 한글 글리프가 없는
+TrueType 폰트도 모두 같은 코드로 그리므로 이름이 바뀌어도 내용 스트림이 같습니다.
+그래서 골든 파일용 PDF 는 상가명/상호를 ASCII 이스케이프(\\uXXXX)로 바꿔서
+reportlab 에 들어 있는 TrueType 폰트(Vera)로 그립니다. 이름이나 순서가 바뀌면
+내용 스트림이 달라지고, TrueType 서브셋 이름(AAAAAA+...)도 함께 비교합니다.
+
+골든 파일은 reportlab 의 연산자 서식을 그대로 담고 있으므로 첫 줄에 만든
+reportlab 버전을 기록하고, 설치된 버전이 다르면 비교를 건너뜁니다.
+출력이 의도적으로 바뀌었거나 reportlab 을 올린 경우 골든 파일을 다시 만듭니다:
+
+    UPDATE_GOLDEN=1 python -m pytest test_reproducible_pdf.py
+"""
+import difflib
+import io
+import os
+
+import pandas as pd
+import pytest
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+import envelope_pipeline
+import pdf_diff
+from envelope_records import EnvelopeRecords
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+input_path = os.path.join(base_dir, "5.xlsx")
+golden_path = os.path.join(base_dir, "golden", "envelopes_5_reproducible.txt")
+
+# 골든 파일용 TrueType 폰트 (reportlab/fonts/Vera.ttf)
+GOLDEN_FONT_NAME = "GoldenVera"
+GOLDEN_FONT_FILE = "Vera.ttf"
+
+EXTRA_TEXT = "감사합니다"
+GOLDEN_EXTRA_TEXT = "Thank you"
+
+VERSION_PREFIX = "%%%% reportlab "
+
+# 실패 메시지에 보여 줄 최대 차이 줄 수
+MAX_DIFF_LINES = 60
+
+
+def sorted_records():
+    records, _ = envelope_pipeline.sort_records(
+        pd.read_excel(input_path), envelope_pipeline.load_number_table()
+    )
+    return records
+
+
+def ascii_records(records):
+    """상가명/상호를 ASCII 이스케이프로 바꾼 레코드 (금액은 원래 값)"""
+    result = EnvelopeRecords()
+    for index, (store_name, business_name, _) in enumerate(records):
+        result.append(
+            store_name.encode("unicode_escape").decode("ascii"),
+            business_name.encode("unicode_escape").decode("ascii"),
+            records.amount_at(index),
+        )
+    return result
+
+
+def render_pdf(records, font_name, extra_text=EXTRA_TEXT):
+    output = io.BytesIO()
+    envelope_pipeline.render_envelopes_pdf(
+        records, output,
+        font_name=font_name,
+        extra_text=extra_text,
+        reproducible=True,
+    )
+    return output.getvalue()
+
+
+def render_golden_pdf():
+    return render_pdf(ascii_records(sorted_records()), GOLDEN_FONT_NAME, GOLDEN_EXTRA_TEXT)
+
+
+def subset_names(pdf_data):
+    return [name for name in pdf_diff.font_names(pdf_data) if "+" in name]
+
+
+def dump_pages(pdf_data):
+    """reportlab 버전, 글꼴 이름, 페이지별 내용 스트림을 골든 파일 텍스트로"""
+    lines = [VERSION_PREFIX + reportlab.Version]
+    lines.extend(f"%%%% font {name}" for name in pdf_diff.font_names(pdf_data))
+    for number, content in enumerate(pdf_diff.page_contents(pdf_data), start=1):
+        lines.append(f"%%%% page {number}")
+        lines.extend(content.decode("latin1").splitlines())
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def golden_font():
+    pdfmetrics.registerFont(TTFont(GOLDEN_FONT_NAME, GOLDEN_FONT_FILE))
+
+
+@pytest.fixture(scope="module")
+def golden_pdf():
+    return render_golden_pdf()
+
+
+def test_reproducible_render_is_byte_identical():
+    records = sorted_records()
+    font_name = envelope_pipeline.FALLBACK_FONT_NAME
+    assert render_pdf(records, font_name) == render_pdf(records, font_name)
+
+
+def test_korean_font_render_is_byte_identical():
+    ok, font_file = envelope_pipeline.register_font()
+    if not ok:
+        pytest.skip("한글 TrueType 폰트가 설치되어 있지 않습니다.")
+
+    records = sorted_records()
+    first = render_pdf(records, envelope_pipeline.KOREAN_FONT_NAME)
+    second = render_pdf(records, envelope_pipeline.KOREAN_FONT_NAME)
+    assert first == second
+
+    # 서브셋 이름은 문서마다 AAAAAA+, AAAAAB+ ... 순서로 다시 매겨짐
+    names = subset_names(first)
+    assert names and names == subset_names(second)
+    assert names[0].startswith("AAAAAA+")
+
+
+def test_golden_render_is_byte_identical(golden_pdf):
+    assert render_golden_pdf() == golden_pdf
+
+
+def test_truetype_subset_names_are_stable(golden_pdf):
+    assert subset_names(golden_pdf) == ["AAAAAA+BitstreamVeraSans-Roman"]
+
+
+def test_ascii_records_keep_names_distinguishable():
+    records = EnvelopeRecords()
+    records.append("1거리", "엠버", 1000)
+    records.append("1상가", "다른", 2000)
+    swapped = EnvelopeRecords()
+    swapped.append("1상가", "다른", 1000)
+    swapped.append("1거리", "엠버", 2000)
+
+    pages = pdf_diff.page_contents(render_pdf(ascii_records(records), GOLDEN_FONT_NAME))
+    swapped_pages = pdf_diff.page_contents(render_pdf(ascii_records(swapped), GOLDEN_FONT_NAME))
+    assert pages != swapped_pages
+
+
+def test_content_streams_match_golden(golden_pdf):
+    actual = dump_pages(golden_pdf)
+
+    if os.environ.get("UPDATE_GOLDEN"):
+        os.makedirs(os.path.dirname(golden_path), exist_ok=True)
+        with open(golden_path, "w", encoding="latin1", newline="\n") as f:
+            f.write(actual)
+
+    with open(golden_path, encoding="latin1", newline="\n") as f:
+        expected = f.read()
+
+    golden_version = expected.split("\n", 1)[0].removeprefix(VERSION_PREFIX)
+    if golden_version != reportlab.Version:
+        pytest.skip(
+            f"골든 파일은 reportlab {golden_version} 으로 만들었습니다 "
+            f"(설치된 버전 {reportlab.Version}). "
+            "UPDATE_GOLDEN=1 로 다시 만든 뒤 차이를 확인하세요."
+        )
+
+    if actual != expected:
+        diff = list(difflib.unified_diff(
+            expected.splitlines(), actual.splitlines(),
+            fromfile="golden", tofile="rendered", lineterm="",
+        ))
+        pytest.fail(
+            "페이지 내용 스트림이 골든 파일과 다릅니다:\n"
+            + "\n".join(diff[:MAX_DIFF_LINES])
+            + ("\n..." if len(diff) > MAX_DIFF_LINES else "")
+        )
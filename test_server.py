@@ -0,0 +1,322 @@
+"""봉투 HTTP API (server.py) 테스트
+
+요청 검증(read_job, parse_options, etag_matches)과 지표 출력은 함수 단위로,
+작업 프로세스 풀과 대기열 제한은 실제 EnvelopeServer 를 띄워서 확인합니다.
+"""
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+# 느린 작업 (대기열/시간 초과 테스트용)
+SLOW_JOB_SECONDS = 1.5
+
+
+def _slow_job(output_format, rows, workbook, options):
+    time.sleep(SLOW_JOB_SECONDS)
+    return b"done", len(rows), 0
+
+
+def make_handler(body=b"", headers=None, max_body=1024):
+    """소켓 없이 read_job 만 호출할 수 있는 요청 핸들러"""
+    handler = server.EnvelopeRequestHandler.__new__(server.EnvelopeRequestHandler)
+    handler.headers = headers if headers is not None else {"Content-Length": str(len(body))}
+    handler.rfile = io.BytesIO(body)
+    handler.server = SimpleNamespace(max_body=max_body)
+    return handler
+
+
+def json_handler(payload):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return make_handler(body, {
+        "Content-Length": str(len(body)),
+        "Content-Type": "application/json",
+    })
+
+
+def request_status(handler, query=None):
+    with pytest.raises(server.RequestError) as excinfo:
+        handler.read_job(query or {})
+    return excinfo.value.status
+
+
+# ---------------------------------------------------------------------------
+# read_job
+# ---------------------------------------------------------------------------
+
+def test_read_job_requires_content_length():
+    assert request_status(make_handler(b"x", headers={})) == 411
+    assert request_status(make_handler(b"x", headers={"Content-Length": "abc"})) == 411
+
+
+def test_read_job_rejects_empty_and_oversized_body():
+    assert request_status(make_handler(b"")) == 400
+    assert request_status(make_handler(b"x" * 2048, max_body=1024)) == 413
+
+
+def test_read_job_rejects_malformed_json():
+    body = b"{not json"
+    handler = make_handler(body, {"Content-Length": str(len(body)), "Content-Type": "application/json"})
+    assert request_status(handler) == 400
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    {"rows": []},
+    {"rows": "abc"},
+    {"rows": [1, 2]},
+    "rows",
+])
+def test_read_job_rejects_bad_rows(payload):
+    assert request_status(json_handler(payload)) == 400
+
+
+@pytest.mark.parametrize("value", [{"a": 1}, [1, 2]])
+def test_read_job_rejects_non_scalar_values(value):
+    handler = json_handler({"rows": [{"상호": "엠버", "금액": value}]})
+    assert request_status(handler) == 400
+
+
+def test_read_job_json_rows_and_options():
+    rows = [{"상가명": "거리", "상호": "엠버", "금액": 541000}]
+    assert json_handler({"rows": rows, "text_size": 14}).read_job({}) == (rows, None, {"text_size": 14})
+    # 최상위 배열도 rows 로 받음
+    assert json_handler(rows).read_job({}) == (rows, None, {})
+
+
+def test_read_job_excel_body_uses_query_options():
+    handler = make_handler(b"xlsx-bytes")
+    query = {"extra_text": ["감사합니다"], "reproducible": ["1"]}
+    assert handler.read_job(query) == (
+        None, b"xlsx-bytes", {"extra_text": "감사합니다", "reproducible": True}
+    )
+
+
+# ---------------------------------------------------------------------------
+# parse_options / etag_matches
+# ---------------------------------------------------------------------------
+
+def test_parse_options_text_size_bounds():
+    low, high = server.TEXT_SIZE_RANGE
+    assert server.parse_options({"text_size": low}) == {"text_size": low}
+    assert server.parse_options({"text_size": str(high)}) == {"text_size": high}
+    for value in (low - 1, high + 1, "big", [12]):
+        with pytest.raises(server.RequestError) as excinfo:
+            server.parse_options({"text_size": value})
+        assert excinfo.value.status == 400
+
+
+def test_parse_options_text_color_and_reproducible():
+    assert server.parse_options({"text_color": "#ff0000"}) == {"text_color": (1.0, 0.0, 0.0)}
+    with pytest.raises(server.RequestError):
+        server.parse_options({"text_color": "#ff00"})
+    assert server.parse_options({"reproducible": True}) == {"reproducible": True}
+    assert server.parse_options({"reproducible": "yes"}) == {"reproducible": True}
+    assert server.parse_options({"reproducible": "0"}) == {"reproducible": False}
+    assert server.parse_options({"extra_text": ""}) == {}
+
+
+def test_etag_matches():
+    etag = '"abc"'
+    assert server.etag_matches('"abc"', etag)
+    assert server.etag_matches('W/"abc"', etag)
+    assert server.etag_matches('"x", W/"abc"', etag)
+    assert server.etag_matches("*", etag)
+    assert not server.etag_matches('"abcd"', etag)
+    assert not server.etag_matches("", etag)
+
+
+# ---------------------------------------------------------------------------
+# 지표
+# ---------------------------------------------------------------------------
+
+def test_metrics_histogram_buckets_are_cumulative():
+    metrics = server.Metrics(workers=2, max_pending=4)
+    for seconds in (0.07, 0.3, 100.0):
+        metrics.observe("/envelopes.pdf", 200, seconds)
+
+    buckets = {}
+    for line in metrics.render().splitlines():
+        if line.startswith("envelope_request_duration_seconds_bucket"):
+            bound = line.split('le="')[1].split('"')[0]
+            buckets[bound] = int(line.rsplit(" ", 1)[1])
+
+    assert buckets["0.05"] == 0
+    assert buckets["0.1"] == 1
+    assert buckets["0.25"] == 1
+    assert buckets["0.5"] == 2
+    assert buckets["30.0"] == 2
+    assert buckets["+Inf"] == 3
+    assert 'envelope_request_duration_seconds_count{endpoint="/envelopes.pdf"} 3' in metrics.render()
+
+
+# ---------------------------------------------------------------------------
+# 실제 서버
+# ---------------------------------------------------------------------------
+
+class RunningServer:
+    def __init__(self, **kwargs):
+        self.server = server.EnvelopeServer(("127.0.0.1", 0), **kwargs)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def post_json(self, path, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(self.base + path, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def metric(self, name):
+        with urllib.request.urlopen(self.base + "/metrics") as response:
+            for line in response.read().decode("utf-8").splitlines():
+                if line.startswith(name + " "):
+                    return float(line.split()[1])
+        raise KeyError(name)
+
+    def slot_free(self):
+        if not self.server.slots.acquire(blocking=False):
+            return False
+        self.server.slots.release()
+        return True
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def start_server():
+    started = []
+
+    def start(**kwargs):
+        running = RunningServer(**kwargs)
+        started.append(running)
+        return running
+
+    yield start
+    for running in started:
+        running.close()
+
+
+@pytest.fixture
+def slow_jobs(monkeypatch):
+    # 작업 프로세스는 서버를 만들 때 fork 되므로 서버보다 먼저 바꿔 둠
+    monkeypatch.setattr(server, "_run_job", _slow_job)
+
+
+ROWS = [{"상가명": "거리", "상호": "엠버", "금액": 541000}]
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_round_trip_pdf_and_data_error(start_server):
+    running = start_server(workers=1, queue_size=1)
+
+    status, body = running.post_json("/envelopes.pdf", {"rows": ROWS})
+    assert status == 200
+    assert body.startswith(b"%PDF")
+
+    # '상호' 컬럼 없음 → EnvelopeDataError → 422
+    status, body = running.post_json("/envelopes.pdf", {"rows": [{"이름": "엠버", "금액": 1000}]})
+    assert status == 422
+    assert "상호" in json.loads(body)["error"]
+
+    assert running.metric("envelope_jobs_in_flight") == 0
+    assert running.slot_free()
+
+
+def test_full_queue_returns_503(start_server, slow_jobs):
+    running = start_server(workers=1, queue_size=0)
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(running.post_json("/envelopes.pdf", {"rows": ROWS})))
+    first.start()
+    assert wait_until(lambda: not running.slot_free())
+
+    status, _ = running.post_json("/envelopes.pdf", {"rows": ROWS})
+    assert status == 503
+    assert running.metric("envelope_jobs_rejected_total") == 1
+
+    first.join()
+    assert results[0][0] == 200
+    assert running.slot_free()
+
+
+def test_timeout_returns_504_and_releases_slot_when_job_finishes(start_server, slow_jobs):
+    running = start_server(workers=2, queue_size=0, job_timeout=0.3)
+
+    status, _ = running.post_json("/envelopes.pdf", {"rows": ROWS})
+    assert status == 504
+
+    # 작업 프로세스에서 아직 실행 중이므로 자리는 그대로 잡혀 있음
+    assert running.metric("envelope_jobs_abandoned") == 1
+    assert running.metric("envelope_jobs_in_flight") == 1
+
+    assert wait_until(lambda: running.metric("envelope_jobs_in_flight") == 0)
+    assert running.metric("envelope_jobs_abandoned") == 0
+    assert running.slot_free()
+    assert running.metric("envelope_pool_restarts_total") == 0
+
+
+def test_timeout_on_every_worker_replaces_pool(start_server, slow_jobs):
+    running = start_server(workers=1, queue_size=0, job_timeout=0.3)
+
+    status, _ = running.post_json("/envelopes.pdf", {"rows": ROWS})
+    assert status == 504
+
+    # 유일한 작업 프로세스가 묶였으므로 풀을 강제로 교체하고 자리를 돌려받음
+    assert wait_until(running.slot_free)
+    assert running.metric("envelope_pool_restarts_total") == 1
+    assert running.server.pool_status()["status"] == "ok"
+
+
+def test_healthz_answers_while_pool_restarts(start_server):
+    running = start_server(workers=1, queue_size=1)
+    warm_up = running.server.warm_up
+
+    def slow_warm_up(pool):
+        time.sleep(SLOW_JOB_SECONDS)
+        return warm_up(pool)
+
+    running.server.warm_up = slow_warm_up
+    for process in list(running.server.pool._processes.values()):
+        process.kill()
+    assert wait_until(lambda: running.server.pool._broken)
+
+    # 망가진 풀에 제출하는 요청이 새 풀을 만들고 예열이 끝난 뒤 처리됨
+    results = []
+    first = threading.Thread(target=lambda: results.append(running.post_json("/envelopes.pdf", {"rows": ROWS})))
+    first.start()
+    assert wait_until(lambda: running.server._restarting)
+
+    # 새 풀을 예열하는 동안에도 잠금을 기다리지 않고 바로 응답
+    started = time.monotonic()
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(running.base + "/healthz")
+    assert excinfo.value.code == 503
+    assert json.loads(excinfo.value.read())["restarting"] is True
+    assert running.post_json("/envelopes.pdf", {"rows": ROWS})[0] == 503
+    assert time.monotonic() - started < SLOW_JOB_SECONDS / 2
+
+    first.join()
+    assert results[0][0] == 200
+    assert running.server.pool_status()["status"] == "ok"